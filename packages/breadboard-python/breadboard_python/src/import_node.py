@@ -1,16 +1,29 @@
 from .main import AttrDict, Board, convert_from_json_to_pydantic
 
-import javascript
-import json
+import orjson
 
 import importlib
+from functools import lru_cache
+
+# `javascript` is imported inside the functions that use it, since importing it starts a Node.js subprocess.
+
+# Imported classes are reused across calls to `require` for the same kit, handler and schema.
+_IMPORTED_CLASS_CACHE: dict[tuple[str, str, bytes], type] = {}
+# Seconds allowed per handler when describing a whole kit in one bridge call (the bridge default per call is 10).
+_DESCRIBE_TIMEOUT_PER_HANDLER = 10
 
 def restart_javascript_module():
+  import javascript
   javascript.config.event_loop.stop()
   importlib.reload(javascript.events)
   importlib.reload(javascript)
+  # Cached JS objects belong to the stopped subprocess.
+  _get_kit.cache_clear()
+  _describe_all_handlers.cache_clear()
 
-def require(package_name):
+@lru_cache(maxsize=None)
+def _get_kit(package_name):
+  import javascript
   try:
     kit_package = javascript.require(package_name)
   except javascript.errors.JavaScriptError:
@@ -18,21 +31,38 @@ def require(package_name):
     # When restarted, it will load correctly.
     restart_javascript_module()
     kit_package = javascript.require(package_name)
-    
+  return kit_package
+
+@lru_cache(maxsize=None)
+def _describe_all_handlers():
+  import javascript
+  # Parsed once by the JS subprocess. Describes all handlers in a single round-trip.
+  return javascript.eval_js('''async (handlers) => JSON.stringify(await Promise.all(Object.entries(handlers).filter(([_, h]) => h.describe).map(async ([k, h]) => [k, await h.describe()])))''')
+
+def require(package_name):
+  kit_package = _get_kit(package_name)
   a = kit_package()
   handlers = a.handlers
 
+  handler_names = list(handlers)
+  # The bridge used to give each describe() call its own 10s default timeout; keep that budget per handler.
+  res = _describe_all_handlers()(handlers, timeout=_DESCRIBE_TIMEOUT_PER_HANDLER * max(len(handler_names), 1))
+  schemas = dict(orjson.loads(res))
+
   output = AttrDict()
-  for handler_name in handlers:
+  for handler_name in handler_names:
+
+    schema = schemas.get(handler_name)
+    key = (package_name, handler_name, orjson.dumps(schema, option=orjson.OPT_SORT_KEYS))
+    if key in _IMPORTED_CLASS_CACHE:
+      output[handler_name] = _IMPORTED_CLASS_CACHE[key]
+      continue
 
     input_schema = {}
     output_schema = {}
-    if handlers[handler_name].describe is None:
+    if schema is None:
       pass
     else:
-      b = handlers[handler_name].describe()
-      res = javascript.eval_js('''JSON.stringify(await b)''')
-      schema = json.loads(res)
       input_schema = schema["inputSchema"]
       output_schema = schema["outputSchema"]
       if handler_name == "invoke":
@@ -46,24 +76,21 @@ def require(package_name):
       description = f"This board is auto-imported from {package_name}"
       version = "0.?"
       _is_node = True
-      # Need to convert SchemaOutput into something that has context.
-      output = AttrDict(converted_output_schema)
-      output_schema1 = converted_output_schema
+      # Resolved once per class instead of on every instantiation.
+      _wildcard_output = bool(getattr(converted_output_schema, "additionalProperties", False))
+      # Kit nodes describe their own schema, so it is left out of the configuration.
+      _include_schema = False
       def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        if hasattr(self.output_schema1, "additionalProperties") and self.output_schema1.additionalProperties:
+        if self._wildcard_output:
           self.output["*"] = self
       def describe(self, input, output):
         pass
-      def get_configuration(self):
-        config = super().get_configuration()
-        if "schema" in config:
-          config.pop("schema")
-        return config
       
       _package_name = package_name
     
 
+    _IMPORTED_CLASS_CACHE[key] = ImportedClass
     output[handler_name] = ImportedClass
   return output
@@ -6,38 +6,41 @@ from pydantic._internal._model_construction import ModelMetaclass
 from typing import Any, Self, Tuple, TypeAlias
 
 from pydantic import BaseModel
-from typing import List, TypeVar, Generic, get_args, Optional, Union, Dict, ClassVar
-from jsonref import replace_refs
+from typing import List, TypeVar, Generic, get_args, Optional, Union, Dict, ClassVar, Set
 
+from collections import OrderedDict
+from functools import lru_cache
+
+import copy
 import inspect
+import json
 import json_fix
 
-def update_json_schema(json_schema, handler: GetJsonSchemaHandler):
+def update_json_schema(json_schema: Dict[str, Any], handler: GetJsonSchemaHandler) -> Dict[str, Any]:
   #json_schema = handler.resolve_ref_schema(json_schema)
-  if "allOf" in json_schema:
-    if "required" in json_schema:
-      json_schema.pop("required")
-    if json_schema["allOf"] == [{"properties": [], "type": "object"}]:
-      pass
-    # TODO: This is hackily replacing allOf with object. Should check if it's an actual SchemaObject.
-    json_schema.pop("allOf")
-    json_schema["type"] = "object"
-  if "required" in json_schema and isinstance(json_schema["required"], list):
+  # Leaf schemas have nothing to update.
+  keys = json_schema.keys() if isinstance(json_schema, dict) else ()
+  if not ("allOf" in keys or "required" in keys or "properties" in keys):
+    return json_schema
+  # Walk the nested properties with an explicit stack instead of recursing.
+  stack = [json_schema]
+  while stack:
+    node = stack.pop()
+    if "allOf" in node:
+      # TODO: This is hackily replacing allOf with object. Should check if it's an actual SchemaObject.
+      node.pop("allOf")
+      node["type"] = "object"
+    props = node.get("properties")
     # Update requried based on whether required = True or False
-    required = []
-    for k, v in json_schema["properties"].items():
-      if v.get("required", False):
-        required.append(k)
-      if "required" in v:
-        v.pop("required")
-    json_schema.pop("required")
+    required = [k for k, v in props.items() if isinstance(v, dict) and v.pop("required", False)] if props else []
+    node.pop("required", None)
     if required:
-      json_schema["required"] = required
-  if "properties" in json_schema:
-    for k, v in json_schema["properties"].items():
-      update_json_schema(v, handler)
-  if "properties" in json_schema and not json_schema["properties"]:
-    json_schema.pop("properties")
+      node["required"] = required
+    if props:
+      # Properties already had their required flag popped above, so only allOf or properties leave work to do.
+      stack.extend(v for v in props.values() if isinstance(v, dict) and ("allOf" in v or "properties" in v))
+    elif props is not None:
+      node.pop("properties")
   return json_schema
 
 def update_final_json_schema(json_schema):
@@ -51,16 +54,32 @@ def update_final_json_schema(json_schema):
       update_final_json_schema(v)
   return json_schema
 
+# Resolved JSON schema per SchemaObject class. Schema classes are not modified after creation.
+_SCHEMA_JSON_CACHE: Dict[type, Dict] = {}
+
+@lru_cache(maxsize=None)
+def _jsonref():
+  # jsonref is only needed when serializing schemas, so it is imported on first use.
+  from jsonref import replace_refs
+  return replace_refs
+
+def _build_schema_json(cls):
+  # Populate the references, remove definitions.
+  output = cls.model_json_schema()
+  output = _jsonref()(output, lazy_load=False)
+  output = update_final_json_schema(output)
+  if "$defs" in output:
+    output.pop("$defs")
+  return output
+
 class SchemaObject(BaseModel):
   @classmethod
   def __json__(cls):
-    # Populate the references, remove definitions.
-    output = cls.model_json_schema()
-    output = replace_refs(output, lazy_load=False)
-    output = update_final_json_schema(output)
-    if "$defs" in output:
-      output.pop("$defs")
-    return output
+    output = _SCHEMA_JSON_CACHE.get(cls)
+    if output is None:
+      output = _SCHEMA_JSON_CACHE[cls] = _build_schema_json(cls)
+    # Callers get their own copy so that mutating it cannot corrupt the cache.
+    return copy.deepcopy(output)
 
   @classmethod
   def __get_pydantic_json_schema__(
@@ -142,7 +161,24 @@ def _parse_type(schema):
     return Any
   return Any
 
+# create_model is expensive, so identical (name, schema) pairs share the generated model.
+# Bounded LRU so that distinct schemas do not pin their generated models forever.
+_CONVERTED_SCHEMA_CACHE_SIZE = 512
+_CONVERTED_SCHEMA_CACHE: "OrderedDict[Tuple[str, str], Tuple[Union[BaseModel, type], Field]]" = OrderedDict()
+
 def convert_from_json_to_pydantic(name, schema) -> Tuple[Union[BaseModel, type], Field]:
+  # The sorted dump is only the cache key; the model is built from the original schema to keep its field order.
+  key = (name, json.dumps(schema, sort_keys=True, default=str))
+  converted = _CONVERTED_SCHEMA_CACHE.get(key)
+  if converted is not None:
+    _CONVERTED_SCHEMA_CACHE.move_to_end(key)
+    return converted
+  converted = _CONVERTED_SCHEMA_CACHE[key] = _convert(name, schema)
+  if len(_CONVERTED_SCHEMA_CACHE) > _CONVERTED_SCHEMA_CACHE_SIZE:
+    _CONVERTED_SCHEMA_CACHE.popitem(last=False)
+  return converted
+
+def _convert(name, schema) -> Tuple[Union[BaseModel, type], Field]:
   if "properties" in schema and "type" in schema and schema["type"] != "object":
     raise Exception(f"Expected type to be object. Got {schema['type']} instead.")
 
@@ -208,14 +244,9 @@ class AttrDict(dict):
   def __init__(self, *args, **kwargs):
     for arg in args:
       # TODO: Handle multiple wildcard matches.
-      kwargs = kwargs | {"*": arg}
-    for k, v in kwargs.items():
-      if isinstance(v, FieldInfo):
-        # instantiate a new AttrDict
-        #v = FieldContext(v)
-        pass
-        # TODO: Populate the other field info into the AttrDict.
-      self[k] = v
+      kwargs["*"] = arg
+    # TODO: Populate the other field info into the AttrDict when v is a FieldInfo.
+    super().update(kwargs)
   def __setattr__(self, key, value):
     if key == "_id":
       return super().__setattr__(key, value)
@@ -270,10 +301,10 @@ def resolve_dict(d):
     return d
   return d
 
-def get_field_name(field: FieldInfo, blob):
+def get_field_name(field: FieldInfo, blob: Dict[str, Any]) -> str:
   """Looks for the field in the blob. If not, checks if field already contains it."""
   for k, v in resolve_dict(blob).items():
-    if type(v) == tuple and v[0] == field:
+    if type(v) is tuple and v[0] == field:
       return k
     if isinstance(v, FieldContext) and v.inner == field:
       return k
@@ -290,16 +321,74 @@ def get_field_name(field: FieldInfo, blob):
     return field._attributes_set["name"]
   raise Exception(f"Can't find {field}")
   
+def _field_index(blob: Dict[str, Any]) -> Dict[int, str]:
+  """Maps the id of each FieldInfo directly held in the blob to its name, for fast lookups before get_field_name."""
+  index: Dict[int, str] = {}
+  for k, v in resolve_dict(blob).items():
+    if type(v) is tuple:
+      v = v[0]
+    if isinstance(v, FieldContext):
+      v = v.inner
+    if isinstance(v, FieldInfo) and id(v) not in index:
+      index[id(v)] = k
+  return index
+
 BOARD_NAMES = {}
 
 # input schema is either a modelmetaclass or dict
 SchemaType = Union[SchemaObject, Dict]
 
+# Edge builders return (from, to, out, in).
+def _board_edge(k, v, n, field_indexes):
+  return (
+    v.get_or_assign_id(required=True),
+    n.get_or_assign_id(required=True),
+    k,
+    "" if k == "*" else k,
+  )
+
+def _field_context_edge(k, v, n, field_indexes):
+  context = v._context
+  index = field_indexes.get(context)
+  if index is None:
+    index = field_indexes[context] = _field_index(context.output)
+  name = index.get(id(v.inner))
+  return (
+    context.get_or_assign_id(required=True),
+    # TODO: This is a hacky way to determine node id. AttrDict should be assigned the id.
+    n.get_or_assign_id(required=True),
+    name if name is not None else get_field_name(v, context.output),
+    k,
+  )
+
+def _attr_dict_edge(k, v, n, field_indexes):
+  # When does an AttrDict happen? It's a nested thing... but sometimes it should be done
+  return (
+    v.get_or_assign_id(required=True),
+    # TODO: This is a hacky way to determine node id. AttrDict should be assigned the id.
+    n.get_or_assign_id(required=True),
+    k,
+    "" if k == "*" else k,
+  )
+
+def _dispatch(handlers, v):
+  """Returns the handler for the first type in handlers that v is an instance of, or None."""
+  for t, h in handlers:
+    if isinstance(v, t):
+      return h
+  return None
+
 """
 A Board can have inputs and outputs.
 When passed as a parameter, it gives outputs.
 """
 class Board(Generic[T, S]):
+  # Per-instance state lives in slots. Subclasses without __slots__ still get a __dict__ for their own components.
+  __slots__ = (
+    "input_schema", "output_schema", "components", "inputs", "input_fields", "set_inputs",
+    "id", "loaded", "output", "_input_board", "_output_board", "__weakref__",
+  )
+
   title = ""
   description = ""
   version = ""
@@ -307,12 +396,12 @@ class Board(Generic[T, S]):
   type = "unknown-board"
 
   SHARED_INDEX = {}
-  output = {}
-  components = {}
   input_board: Optional[Self] = None
   output_board: Optional[Self] = None
   _is_node: bool = False
   _package_name = None
+  # Whether get_configuration includes the input schema.
+  _include_schema: bool = True
 
   # This is only used within the context of the parent of this Board, if there is one.
   # If there is no parent, this identifier is not used.
@@ -324,25 +413,54 @@ class Board(Generic[T, S]):
   def is_leaf(self) -> bool:
     return self._is_node
 
-  def _get_schema(self) -> Tuple[SchemaType, SchemaType]:
+  @classmethod
+  def _schema_for_cls(cls) -> Tuple[SchemaType, SchemaType]:
+    # The schemas only depend on the class, so they are stored on it after the first lookup.
+    # Subclasses have their own entry since this reads cls.__dict__ directly.
+    schemas = cls.__dict__.get("_cls_schemas")
+    if schemas is not None:
+      return schemas
+
     # Get input/output schema from typing
-    if type(self).__orig_bases__[0].__origin__ == Generic:
+    if cls.__orig_bases__[0].__origin__ == Generic:
       # This means that the Board is still generic and has no input/output schema defined.
       input_schema = Any
       output_schema = Any
       #raise Exception("Board does not have input and output schemas defined.")
     else:
-      input_schema, output_schema = get_args(type(self).__orig_bases__[0])
+      input_schema, output_schema = get_args(cls.__orig_bases__[0])
 
     if not isinstance(input_schema, type) and not isinstance(input_schema, SchemaObject):
       raise Exception(f"Invalid type for schema input: {type(input_schema)}")
     if not isinstance(output_schema, type) and not isinstance(output_schema, SchemaObject):
       raise Exception(f"Invalid type for schema output: {type(output_schema)}")
-    return input_schema, output_schema
+    cls._cls_schemas = (input_schema, output_schema)
+    return cls._cls_schemas
+
+  @classmethod
+  def _output_fields_for_cls(cls) -> Dict[str, FieldInfo]:
+    # Named output FieldInfos, shared by every instance of the class. Instances wrap them in their own FieldContext.
+    fields = cls.__dict__.get("_cls_output_fields")
+    if fields is not None:
+      return fields
+
+    fields = {}
+    _, output_schema = cls._schema_for_cls()
+    if output_schema and isinstance(output_schema, ModelMetaclass):
+      for k, v in output_schema.model_fields.items():
+        if not isinstance(v, FieldInfo):
+          raise Exception("Unexpected model_field. No FieldInfo")
+        # populate name into fieldinfo if it doesn't exist.
+        #if not hasattr(v, "name"):
+        if "name" not in v._attributes_set and (not v.json_schema_extra or "name" not in v.json_schema_extra):
+          v = FieldInfo.merge_field_infos(FieldInfo(name=k), v, name=k)
+        fields[k] = v
+    cls._cls_output_fields = fields
+    return fields
 
 
   def __init__(self, *args, **kwargs) -> None:
-    self.input_schema, self.output_schema = self._get_schema()
+    self.input_schema, self.output_schema = type(self)._schema_for_cls()
     self.components = {}
     # For the highest level Board, inputs will always just be the input schemas.
     # For the second-level Boards, inputs will be replaced with values or other edges.
@@ -381,19 +499,8 @@ class Board(Generic[T, S]):
     self.__call__(*args, **kwargs)
 
 
-    self.output = AttrDict()
-    if self.output_schema and isinstance(self.output_schema, ModelMetaclass):
-      for k, v in self.output_schema.model_fields.items():
-        if isinstance(v, FieldInfo):
-          # populate name into fieldinfo if it doesn't exist.
-          #if not hasattr(v, "name"):
-          if "name" not in v._attributes_set and (not v.json_schema_extra or "name" not in v.json_schema_extra):
-            v = FieldInfo.merge_field_infos(FieldInfo(name=k), v, name=k)
-          v = FieldContext(v, self)
-        else:
-          raise Exception("Unexpected model_field. No FieldInfo")
-        self.output[k] = v
-      #self.output = AttrDict(self.output_schema.model_fields)
+    self.output = AttrDict(**{k: FieldContext(v, self) for k, v in type(self)._output_fields_for_cls().items()})
+    #self.output = AttrDict(self.output_schema.model_fields)
     
 
   def __setattr__(self, name, value):
@@ -413,6 +520,9 @@ class Board(Generic[T, S]):
     self.loaded = False
 
   def __getattr__(self, name):
+    if name in Board.__slots__:
+      # An unset slot (e.g. during __init__) should not be looked up in the outputs.
+      raise AttributeError(name)
     if name in self.output:
       v = self.output[name]
     elif "*" in self.output: # when this Board outputs wildcard.
@@ -433,7 +543,8 @@ class Board(Generic[T, S]):
     if self.input_schema and isinstance(self.input_schema, ModelMetaclass):
       if "schema" in config:
         raise Exception(f"Already have 'schema' key populated in config. This is a reserved field name. Config: {config}")
-      config["schema"] = self.input_schema.__json__()
+      if self._include_schema:
+        config["schema"] = self.input_schema.__json__()
     for k, v in config.items():
       if inspect.isclass(v):
         if issubclass(v, Board):
@@ -486,39 +597,10 @@ class Board(Generic[T, S]):
     _input_board, output_board = self.get_or_create_input_output_nodes()
     all_components = [(k, v) for k, v in self.components.items()] + [(output_board.get_or_assign_id(required=True), output_board)]
 
-    # Component can be a Board or an AttrDict.
-    already_visited_nodes = set()
-    def iterate_component(name, component, assign_name=True) -> List[Dict]:
-      nodes = []
-      if component == self:
-        raise Exception("why")
-      if isinstance(component, Board):
-        if component in already_visited_nodes:
-          return nodes
-        already_visited_nodes.add(component)
-        inputs = component.set_inputs
-        component.get_or_assign_id(name) if name != "*" and assign_name else component.get_or_assign_id(),
-        nodes.append(component)
-
-      elif isinstance(component, AttrDict):
-        inputs = component
-      elif isinstance(component, FieldContext):
-        nodes.extend(iterate_component(component._context.id, component._context))
-        return nodes
-      else:
-        raise Exception("Unexpected component type.")
-      for k, vs in inputs.items():
-        for v in vs:
-          if isinstance(v, Board):
-            nodes.extend(iterate_component(k, v, assign_name=False))
-          elif isinstance(v, AttrDict):
-            nodes.extend(iterate_component(k, v, assign_name=False))
-          elif isinstance(v, FieldContext):
-            nodes.extend(iterate_component(k, v._context, assign_name=False))
-      return nodes
-
+    # Visited Boards are tracked by id; they stay referenced by the graph for the whole walk.
+    already_visited_ids: Set[int] = set()
     for name, component in all_components:
-      all_nodes.extend(iterate_component(name, component))
+      all_nodes.extend(_iterate_component(self, name, component, already_visited_ids))
 
     return all_nodes
 
@@ -539,56 +621,24 @@ class Board(Generic[T, S]):
     self.describe(input_board, output_board)
 
     kits = set()
-    replace_mapping = {}
+    replace_mapping: Dict[Board, Board] = {}
 
-
-
-    def expand_boards(parent):
-      current_nodes = parent.get_all_components()
-      initial_all_nodes = [x for x in current_nodes]
-      #current_nodes = set(current_nodes)
-      result = []
-
-      for each_component in initial_all_nodes:
-        # for each component, if they can be expanded, get their input/output nodes.
-        if each_component.is_leaf():
-          if each_component not in result:
-            result.append(each_component)
-          continue
-        i_node, o_node = each_component.get_or_create_input_output_nodes()
-        each_component.describe(i_node, o_node)
-        for x in expand_boards(each_component):
-          if x not in result:
-            result.append(x)
-        replace_mapping[each_component] = o_node
-
-        # These inputs need to be added after all boards are expanded. Otherwise board expansion will leak out of the context.
-        # are these inputs needed when describing?
-        # probably not? I don't think inputs should override.
-        for k, vs in each_component.set_inputs.items():
-          if not k in i_node.set_inputs:
-            i_node.set_inputs[k] = []
-          i_node.set_inputs[k].extend(vs)
-        #i_node.set_inputs.update(each_component.set_inputs)
-        i_node.inputs.update(each_component.inputs)
-      return result
-
-    all_nodes = expand_boards(self)
+    all_nodes = _expand_boards(self, replace_mapping)
 
     if self.is_leaf():
       self.get_or_assign_id("some-leaf")
       all_nodes = [self]
 
     # Generate nodes
+    # Node and edge fields are collected in parallel lists and only zipped into dicts at the end.
+    node_ids: List[str] = []
+    node_types: List[str] = []
+    node_configs: List[Dict] = []
     for component in all_nodes:
-      inputs = component.set_inputs
-      node = {
-        # Assign type if is dependency. Assign name if is the Board.
-        "id": component.get_or_assign_id(required=True),
-        "type": component.type,
-        "configuration": component.get_configuration(),
-      }
-      output["nodes"].append(node)
+      # Assign type if is dependency. Assign name if is the Board.
+      node_ids.append(component.get_or_assign_id(required=True))
+      node_types.append(component.type)
+      node_configs.append(component.get_configuration())
 
       # check for kit
       package_name = getattr(component, "_package_name", None)
@@ -618,58 +668,49 @@ class Board(Generic[T, S]):
     # Populate Edges
     output["edges"] = []
 
-    all_edges = []
+    edge_froms: List[str] = []
+    edge_tos: List[str] = []
+    edge_outs: List[str] = []
+    edge_ins: List[str] = []
+    # Output field indexes per Board, built on first use.
+    field_indexes: Dict[Board, Dict[int, str]] = {}
     for n in all_nodes:
       inputs = n.set_inputs
       for k, vs in inputs.items():
         for v in vs:
           if v in replace_mapping:
             v = replace_mapping[v]
-          if isinstance(v, Board):
-            edge = {
-              "from": v.get_or_assign_id(required=True),
-              "to": n.get_or_assign_id(required=True),
-              "out": k,
-              "in": "" if k == "*" else k,
-            }
-            all_edges.append(edge)
-          elif isinstance(v, FieldContext):
-            edge = {
-              "from": v._context.get_or_assign_id(required=True),
-              # TODO: This is a hacky way to determine node id. AttrDict should be assigned the id.
-              "to": n.get_or_assign_id(required=True),
-              "out": get_field_name(v, v._context.output),
-              "in": k,
-              }
-            all_edges.append(edge)
-          elif isinstance(v, AttrDict):
-            # When does an AttrDict happen? It's a nested thing... but sometimes it should be done
-            edge = {
-              "from": v.get_or_assign_id(required=True),
-              # TODO: This is a hacky way to determine node id. AttrDict should be assigned the id.
-              "to": n.get_or_assign_id(required=True),
-              "out": k,
-              "in": "" if k == "*" else k,
-            }
-            all_edges.append(edge)
-          else:
+          build_edge = _dispatch(_EDGE_BUILDERS, v)
+          if build_edge is None:
             raise Exception("Unexpected type")
-
-    output["edges"] = all_edges
+          edge_from, edge_to, edge_out, edge_in = build_edge(k, v, n, field_indexes)
+          edge_froms.append(edge_from)
+          edge_tos.append(edge_to)
+          edge_outs.append(edge_out)
+          edge_ins.append(edge_in)
+
+    output["nodes"] = [
+      {"id": i, "type": t, "configuration": c}
+      for i, t, c in zip(node_ids, node_types, node_configs)
+    ]
+    output["edges"] = [
+      {"from": f, "to": t, "out": o, "in": i}
+      for f, t, o, i in zip(edge_froms, edge_tos, edge_outs, edge_ins)
+    ]
     
     # Populate Kits
     output["kits"] = [{"url": f"npm:{x}"} for x in kits]
     return output
   
-  def _get_resolved_inputs(self):
-    resolved_inputs = {}
+  def _get_resolved_inputs(self) -> Dict[str, Any]:
+    resolved_inputs: Dict[str, Any] = {}
     for k, v in self.inputs.items():
       if k != "*":
         resolved_inputs[k] = v
       elif isinstance(v, Board):
         resolved_inputs[k] = v
       else:
-        resolved_inputs = resolved_inputs | v
+        resolved_inputs.update(v)
     return resolved_inputs
   
   def __call__(self, *args, **kwargs) -> S:
@@ -706,14 +747,14 @@ class Board(Generic[T, S]):
         self.inputs[k] = v
 
     if self.input_schema and isinstance(self.input_schema, ModelMetaclass):
+      inputs = self.inputs
       for k, v in self.input_schema.model_fields.items():
-        if isinstance(v, FieldInfo):
-          v = FieldContext(v, self)
-        else:
-          raise Exception("Unexpected model_field. No FieldInfo")
-        if k not in self.inputs:
-          self.inputs[k] = v
+        if k in inputs:
           # If k is already populated in the input, no need to populate it now.
+          continue
+        if not isinstance(v, FieldInfo):
+          raise Exception("Unexpected model_field. No FieldInfo")
+        inputs[k] = FieldContext(v, self)
     # Arg should be treated as dicts
     # TODO: When passed in a whole arg, it should be wildcarded.
         
@@ -737,6 +778,65 @@ class Board(Generic[T, S]):
   def describe(self, input: T, output: S) -> S:
     pass
 
-
-
-
+# Component can be a Board or an AttrDict.
+def _iterate_component(root: Board, name: Optional[str], component: Union[Board, AttrDict, FieldContext], already_visited_ids: Set[int], assign_name: bool = True) -> List[Board]:
+  nodes: List[Board] = []
+  if component == root:
+    raise Exception("why")
+  if isinstance(component, Board):
+    component_id = id(component)
+    if component_id in already_visited_ids:
+      return nodes
+    already_visited_ids.add(component_id)
+    inputs = component.set_inputs
+    component.get_or_assign_id(name) if name != "*" and assign_name else component.get_or_assign_id(),
+    nodes.append(component)
+
+  elif isinstance(component, AttrDict):
+    inputs = component
+  elif isinstance(component, FieldContext):
+    nodes.extend(_iterate_component(root, component._context.id, component._context, already_visited_ids))
+    return nodes
+  else:
+    raise Exception("Unexpected component type.")
+  for k, vs in inputs.items():
+    for v in vs:
+      source = _dispatch(_COMPONENT_SOURCES, v)
+      if source is not None:
+        nodes.extend(_iterate_component(root, k, source(v), already_visited_ids, assign_name=False))
+  return nodes
+
+def _expand_boards(parent: Board, replace_mapping: Dict[Board, Board]) -> List[Board]:
+  current_nodes = parent.get_all_components()
+  initial_all_nodes = [x for x in current_nodes]
+  #current_nodes = set(current_nodes)
+  result: List[Board] = []
+
+  for each_component in initial_all_nodes:
+    # for each component, if they can be expanded, get their input/output nodes.
+    if each_component.is_leaf():
+      if each_component not in result:
+        result.append(each_component)
+      continue
+    i_node, o_node = each_component.get_or_create_input_output_nodes()
+    each_component.describe(i_node, o_node)
+    for x in _expand_boards(each_component, replace_mapping):
+      if x not in result:
+        result.append(x)
+    replace_mapping[each_component] = o_node
+
+    # These inputs need to be added after all boards are expanded. Otherwise board expansion will leak out of the context.
+    # are these inputs needed when describing?
+    # probably not? I don't think inputs should override.
+    for k, vs in each_component.set_inputs.items():
+      if not k in i_node.set_inputs:
+        i_node.set_inputs[k] = []
+      i_node.set_inputs[k].extend(vs)
+    #i_node.set_inputs.update(each_component.set_inputs)
+    i_node.inputs.update(each_component.inputs)
+  return result
+
+# (type, handler) pairs checked in order when walking a Board's inputs. Board comes first since most inputs are Boards.
+# Nodes are almost always Board subclasses (and InputBoard/OutputBoard are created per instance), so there is no per-type memo.
+_EDGE_BUILDERS = ((Board, _board_edge), (FieldContext, _field_context_edge), (AttrDict, _attr_dict_edge))
+_COMPONENT_SOURCES = ((Board, lambda v: v), (AttrDict, lambda v: v), (FieldContext, lambda v: v._context))